@@ -7,19 +7,44 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.model_selection import train_test_split
-import joblib
 import logging
 from typing import Tuple, Dict, Any
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import polars as pl
+except ImportError:  # polars is optional; the pandas pipeline is used without it
+    pl = None
+
 logger = logging.getLogger(__name__)
 
+def _minmax_scaler_from_stats(data_min: np.ndarray, data_max: np.ndarray, n_samples: int) -> MinMaxScaler:
+    """Build a fitted MinMaxScaler (feature_range=(0, 1)) from precomputed column min/max."""
+    scaler = MinMaxScaler()
+    scaler.data_min_ = data_min
+    scaler.data_max_ = data_max
+    scaler.data_range_ = data_max - data_min
+    scaler.scale_ = 1.0 / np.where(scaler.data_range_ == 0, 1.0, scaler.data_range_)
+    scaler.min_ = -data_min * scaler.scale_
+    scaler.n_samples_seen_ = n_samples
+    scaler.n_features_in_ = len(data_min)
+    return scaler
+
+def _standard_scaler_from_stats(mean: np.ndarray, var: np.ndarray, n_samples: int) -> StandardScaler:
+    """Build a fitted StandardScaler from precomputed column mean/population variance."""
+    scaler = StandardScaler()
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scaler.scale_ = np.where(var == 0, 1.0, np.sqrt(var))
+    scaler.n_samples_seen_ = n_samples
+    scaler.n_features_in_ = len(mean)
+    return scaler
+
 class DataPreprocessor:
     """Handles data preprocessing and feature engineering."""
     
-    def __init__(self, data_path: str = 'dummy_dataset.csv'):
+    def __init__(self, data_path: str = 'dummy_dataset.csv', use_polars: bool = True):
         self.data_path = data_path
+        self.use_polars = use_polars and pl is not None
         self.scalers = {}
         self.feature_columns = [
             'renewable_proximity', 
@@ -35,43 +60,42 @@ class DataPreprocessor:
     def load_data(self) -> pd.DataFrame:
         """Load data from CSV file."""
         try:
-            df = pd.read_csv(self.data_path)
-            logger.info(f"Loaded data with shape: {df.shape}")
+            if self.use_polars:
+                df = pl.read_csv(self.data_path).to_pandas()
+            else:
+                df = pd.read_csv(self.data_path, engine='pyarrow')
+            logger.info("Loaded data with shape: %s", df.shape)
             return df
         except FileNotFoundError:
-            logger.error(f"File {self.data_path} not found")
+            logger.error("File %s not found", self.data_path)
             raise
             
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and validate the dataset."""
         # Check for missing values
-        missing_values = df.isnull().sum()
-        if missing_values.any():
-            logger.warning(f"Missing values found: {missing_values[missing_values > 0]}")
+        if df.isnull().any().any():
+            logger.warning("Missing values found, dropping incomplete rows")
             df = df.dropna()
             
-        # Validate data ranges
-        df = df[(df['renewable_proximity'] >= 0) & (df['renewable_proximity'] <= 1)]
-        df = df[(df['demand_proximity'] >= 0) & (df['demand_proximity'] <= 1)]
-        df = df[(df['transport_score'] >= 0) & (df['transport_score'] <= 1)]
-        df = df[(df['subsidy_score'] >= 0) & (df['subsidy_score'] <= 1)]
-        df = df[df['land_cost'] > 0]
-        df = df[df['energy_cost'] > 0]
-        df = df[df['cost_per_kg'] > 0]
-        
-        logger.info(f"Data cleaned. Remaining rows: {len(df)}")
+        # Validate data ranges with a single combined mask and one slice
+        unit_range = df[['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']].to_numpy()
+        mask = (unit_range >= 0).all(axis=1) & (unit_range <= 1).all(axis=1)
+        mask &= (df['land_cost'].to_numpy() > 0) & (df['energy_cost'].to_numpy() > 0) & (df['cost_per_kg'].to_numpy() > 0)
+        df = df.loc[mask].copy()
+        
+        logger.info("Data cleaned. Remaining rows: %d", len(df))
         return df
     
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create additional features if needed."""
-        # Example: Create composite scores
-        df['infrastructure_score'] = (df['renewable_proximity'] * 0.4 + 
-                                     df['demand_proximity'] * 0.3 + 
-                                     df['transport_score'] * 0.3)
+        # Example: Create composite scores as one matrix-vector product each
+        # infrastructure_score = 0.4 * renewable + 0.3 * demand + 0.3 * transport
+        infra_vals = df[['renewable_proximity', 'demand_proximity', 'transport_score']].to_numpy()
+        df['infrastructure_score'] = infra_vals @ np.array([0.4, 0.3, 0.3], dtype=infra_vals.dtype)
         
-        df['cost_factor'] = (df['land_cost'] / 1000000 * 0.4 + 
-                            df['energy_cost'] * 100 * 0.4 + 
-                            (1 - df['subsidy_score']) * 0.2)
+        # cost_factor = land_cost / 1e6 * 0.4 + energy_cost * 100 * 0.4 + (1 - subsidy_score) * 0.2
+        cost_vals = df[['land_cost', 'energy_cost', 'subsidy_score']].to_numpy(dtype=np.float64)
+        df['cost_factor'] = cost_vals @ np.array([0.4 / 1e6, 40.0, -0.2]) + 0.2
         
         logger.info("Feature engineering completed")
         return df
@@ -81,32 +105,114 @@ class DataPreprocessor:
         df_normalized = df.copy()
         
         # For efficiency features (0-1 range expected)
+        # Scalers preserve float32 input, so training data matches the float32 inference path
         efficiency_features = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
         minmax_scaler = MinMaxScaler()
-        df_normalized[efficiency_features] = minmax_scaler.fit_transform(df[efficiency_features])
+        df_normalized[efficiency_features] = minmax_scaler.fit_transform(df[efficiency_features].astype(np.float32))
         self.scalers['efficiency'] = minmax_scaler
         
         # For cost features (large ranges)
         cost_features = ['land_cost', 'energy_cost']
         standard_scaler = StandardScaler()
-        df_normalized[cost_features] = standard_scaler.fit_transform(df[cost_features])
+        df_normalized[cost_features] = standard_scaler.fit_transform(df[cost_features].astype(np.float32))
         self.scalers['cost'] = standard_scaler
         
         logger.info("Features normalized")
         return df_normalized, self.scalers
     
+    def prepare_training_data_lazy(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Polars equivalent of load -> clean -> engineer -> normalize. Cleaning and
+        feature engineering run as one lazy query; scaler statistics come from a
+        single aggregation over the collected frame.
+        """
+        unit_range = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
+        efficiency_features = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
+        cost_features = ['land_cost', 'energy_cost']
+        
+        lf = (
+            pl.scan_csv(self.data_path)
+            .drop_nulls()
+            .filter(
+                pl.all_horizontal([pl.col(c).is_between(0, 1) for c in unit_range])
+                & (pl.col('land_cost') > 0)
+                & (pl.col('energy_cost') > 0)
+                & (pl.col('cost_per_kg') > 0)
+            )
+            .with_columns([
+                (pl.col('renewable_proximity') * 0.4 +
+                 pl.col('demand_proximity') * 0.3 +
+                 pl.col('transport_score') * 0.3).alias('infrastructure_score'),
+                (pl.col('land_cost') / 1000000 * 0.4 +
+                 pl.col('energy_cost') * 100 * 0.4 +
+                 (1 - pl.col('subsidy_score')) * 0.2).alias('cost_factor')
+            ])
+            .with_columns(pl.col(efficiency_features + cost_features).cast(pl.Float32))
+        )
+        df = lf.collect(streaming=True)
+        logger.info("Loaded and cleaned data with polars. Remaining rows: %d", df.height)
+        
+        stats = df.select(
+            [pl.col(c).min().alias(f'{c}_min') for c in efficiency_features] +
+            [pl.col(c).max().alias(f'{c}_max') for c in efficiency_features] +
+            [pl.col(c).cast(pl.Float64).mean().alias(f'{c}_mean') for c in cost_features] +
+            [pl.col(c).cast(pl.Float64).var(ddof=0).alias(f'{c}_var') for c in cost_features]
+        ).row(0, named=True)
+        
+        # Fit sklearn scalers from the computed stats so both pipelines export the same parameters
+        minmax_scaler = _minmax_scaler_from_stats(
+            np.array([stats[f'{c}_min'] for c in efficiency_features], dtype=np.float64),
+            np.array([stats[f'{c}_max'] for c in efficiency_features], dtype=np.float64),
+            df.height
+        )
+        standard_scaler = _standard_scaler_from_stats(
+            np.array([stats[f'{c}_mean'] for c in cost_features]),
+            np.array([stats[f'{c}_var'] for c in cost_features]),
+            df.height
+        )
+        self.scalers['efficiency'] = minmax_scaler
+        self.scalers['cost'] = standard_scaler
+        
+        df = df.with_columns(
+            [(pl.col(c) * scale + offset).cast(pl.Float32).alias(c)
+             for c, scale, offset in zip(efficiency_features, minmax_scaler.scale_, minmax_scaler.min_)] +
+            [((pl.col(c) - mean) / scale).cast(pl.Float32).alias(c)
+             for c, mean, scale in zip(cost_features, standard_scaler.mean_, standard_scaler.scale_)]
+        )
+        df.write_parquet('processed_dataset.parquet', compression='zstd')
+        
+        logger.info("Features normalized")
+        return df.to_pandas(), self.scalers
+    
+    def save_scaler_params(self, path: str = 'models/scalers.npz'):
+        """
+        Save only the fitted scaler parameters needed at inference:
+        MinMaxScaler X * scale_ + min_ and StandardScaler (X - mean_) / scale_.
+        """
+        np.savez(
+            path,
+            eff_scale=self.scalers['efficiency'].scale_,
+            eff_offset=self.scalers['efficiency'].min_,
+            cost_mean=self.scalers['cost'].mean_,
+            cost_scale=self.scalers['cost'].scale_
+        )
+    
     def prepare_training_data(self) -> Tuple[pd.DataFrame, Dict[str, Any]]:
         """Complete preprocessing pipeline."""
-        df = self.load_data()
-        df = self.clean_data(df)
-        df = self.engineer_features(df)
-        df_normalized, scalers = self.normalize_features(df)
+        if self.use_polars:
+            df_normalized, scalers = self.prepare_training_data_lazy()
+        else:
+            df = self.load_data()
+            df = self.clean_data(df)
+            df = self.engineer_features(df)
+            df_normalized, scalers = self.normalize_features(df)
+            
+            # Save processed data
+            df_normalized.to_parquet('processed_dataset.parquet', engine='pyarrow', compression='zstd', index=False)
         
-        # Save processed data
-        df_normalized.to_csv('processed_dataset.csv', index=False)
-        joblib.dump(scalers, 'models/scalers.pkl')
+        self.save_scaler_params()
         
-        logger.info("Preprocessing completed. Data saved to processed_dataset.csv")
+        logger.info("Preprocessing completed. Data saved to processed_dataset.parquet")
         return df_normalized, scalers
     
     def get_feature_sets(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
@@ -114,17 +220,18 @@ class DataPreprocessor:
         # Features for efficiency prediction
         efficiency_features = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
         X_eff = df[efficiency_features]
-        y_eff = df[self.efficiency_target]
+        y_eff = df[self.efficiency_target].astype(np.float32)
         
         # Features for cost prediction
         cost_features = ['land_cost', 'energy_cost', 'demand_proximity', 'subsidy_score']
         X_cost = df[cost_features]
-        y_cost = df[self.cost_target]
+        y_cost = df[self.cost_target].astype(np.float32)
         
         return X_eff, X_cost, y_eff, y_cost
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     preprocessor = DataPreprocessor('dummy_dataset.csv')
     processed_data, scalers = preprocessor.prepare_training_data()
     
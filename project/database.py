@@ -0,0 +1,65 @@
+"""
+PostgreSQL connection pooling for the Green Hydrogen Infrastructure backend.
+Connections are opened once per process and reused across requests.
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import pool
+
+logger = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'database': os.getenv('DB_NAME', 'green_hydrogen_db'),
+    'user': os.getenv('DB_USER', 'hydro_user'),
+    'password': os.getenv('DB_PASSWORD', 'hydrogen123'),
+    'port': os.getenv('DB_PORT', '5432')
+}
+MIN_CONNECTIONS = 1
+MAX_CONNECTIONS = 16
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> pool.ThreadedConnectionPool:
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pool.ThreadedConnectionPool(MIN_CONNECTIONS, MAX_CONNECTIONS, **DB_CONFIG)
+                logger.info("Database pool created for %s:%s", DB_CONFIG['host'], DB_CONFIG['port'])
+    return _pool
+
+@contextmanager
+def connection():
+    """
+    Borrow a pooled connection, rolling back on error and returning it to the pool.
+    Broken connections are closed instead of being handed to the next caller.
+    """
+    db_pool = get_pool()
+    conn = db_pool.getconn()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error as rollback_error:
+            # Keep the original error; the failed rollback only means the connection is unusable
+            logger.warning("Rollback failed, discarding connection: %s", rollback_error)
+            conn.close()
+        raise
+    finally:
+        db_pool.putconn(conn, close=bool(conn.closed))
+
+def close_pool():
+    """Close all pooled connections."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
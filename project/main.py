@@ -1,15 +1,32 @@
 """
 Main entry point for the Green Hydrogen Infrastructure backend.
+
+Environment variables:
+    WORKERS  Number of worker processes (defaults to the CPU count). Each worker
+             uses CPU count // WORKERS threads for inference.
+    DEV      Set to 1 to enable auto-reload. Development only; runs a single worker.
 """
 
+import os
+import logging
 import uvicorn
-from predict_api import app
+
+# Configured at import so spawned worker processes, which re-import this
+# module, get the same process-level logging setup
+logging.basicConfig(level=logging.INFO)
 
 if __name__ == "__main__":
+    # The app is passed as an import string so each worker process imports
+    # predict_api and loads its own models; nothing is loaded in the supervisor.
+    reload = os.getenv('DEV') == '1'
+    workers = 1 if reload else int(os.getenv('WORKERS', os.cpu_count() or 1))
+    # Exported so each worker can size its thread pools to its share of the cores
+    os.environ['WORKERS'] = str(workers)
     uvicorn.run(
-        app,
+        "predict_api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # Auto-reload during development
+        workers=workers,
+        reload=reload,  # Auto-reload during development only
         log_level="info"
-    )
\ No newline at end of file
+    )
@@ -8,19 +8,39 @@ from pydantic import BaseModel
 import joblib
 import numpy as np
 import pandas as pd
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 import logging
+import functools
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+import database
+
+try:
+    import treelite_runtime
+except ImportError:  # Compiled predictors are optional; fall back to the joblib pickles
+    treelite_runtime = None
+
+try:
+    import cupy
+except ImportError:  # GPU inference is optional; batches are scored on the CPU without it
+    cupy = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the NumPy featurization path is used without it
+    njit = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Green Hydrogen Infrastructure API",
     description="API for predicting hydrogen production efficiency and cost",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 class PredictionResponse(BaseModel):
@@ -36,6 +56,159 @@ class PredictionRequest(BaseModel):
     """Request model for batch predictions."""
     locations: List[Dict[str, float]]  # List of {lat, lng} objects
 
+# Column order of the feature matrix produced by ModelManager.get_dummy_features_batch
+FEATURE_COLUMNS = [
+    'renewable_proximity',
+    'demand_proximity',
+    'transport_score',
+    'land_cost',
+    'energy_cost',
+    'subsidy_score'
+]
+EFFICIENCY_FEATURES = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
+COST_FEATURES = ['land_cost', 'energy_cost', 'demand_proximity', 'subsidy_score']
+EFFICIENCY_COLUMN_INDEX = [FEATURE_COLUMNS.index(f) for f in EFFICIENCY_FEATURES]
+COST_COLUMN_INDEX = [FEATURE_COLUMNS.index(f) for f in COST_FEATURES]
+
+# Coordinates are quantized to ~11 m before prediction so repeated map tiles share cache entries
+COORD_DECIMALS = 4
+PREDICTION_CACHE_SIZE = 65536
+
+# Zone labels indexed by (efficiency > 0.6) + (efficiency > 0.8 and cost < 2.5)
+_ZONES = np.array(['red', 'yellow', 'green'])
+
+# Batches larger than this are split into one shard per core of this worker's thread budget
+PARALLEL_BATCH_THRESHOLD = 4096
+
+# Below this many rows the host-to-GPU transfer costs more than GPU tree traversal saves
+GPU_BATCH_THRESHOLD = 1024
+
+def thread_budget() -> int:
+    """
+    Cores available to this process: the CPU count split evenly across the
+    uvicorn workers started by main.py (WORKERS), and at least 1.
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, int(os.getenv('WORKERS', 1))))
+
+_NOISE_STREAMS = np.arange(6, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+
+def quantize_coords(values: np.ndarray) -> np.ndarray:
+    """
+    Round coordinates to COORD_DECIMALS. Shared by the single and batch paths so
+    half-way values (e.g. 2.89235) land on the same grid point in both.
+    """
+    return np.round(values, COORD_DECIMALS)
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied elementwise to a uint64 array."""
+    z = x + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def _location_noise(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Deterministic standard normal noise of shape (B, 6) derived from coordinates.
+    Stateless (no global or per-instance PRNG), so it is safe under concurrent
+    requests and a location gets the same noise regardless of the batch it is in.
+    """
+    lat_keys = np.round(lats * 1e6).astype(np.int64).view(np.uint64)
+    lng_keys = np.round(lngs * 1e6).astype(np.int64).view(np.uint64)
+    keys = _splitmix64(lat_keys) ^ lng_keys
+    bits = _splitmix64(keys[:, None] + _NOISE_STREAMS)
+    
+    # Top 24 bits -> float32 uniforms in (0, 1)
+    uniforms = ((bits >> np.uint64(40)).astype(np.float32) + np.float32(0.5)) * np.float32(2.0 ** -24)
+    
+    # Box-Muller: three uniform pairs -> six independent normals
+    radius = np.sqrt(np.float32(-2.0) * np.log(uniforms[:, 0::2]))
+    angle = np.float32(2.0 * np.pi) * uniforms[:, 1::2]
+    return np.hstack((radius * np.cos(angle), radius * np.sin(angle)))
+
+def _featurize_rows(lats, lngs, noise, eff_scale, eff_offset, cost_mean, cost_scale, out_eff, out_cost):
+    """
+    Fused dummy features + scaling for a batch, writing model inputs into out_eff/out_cost.
+    Same arithmetic as get_dummy_features_batch followed by preprocess_features_batch;
+    noise is pre-sampled by _location_noise. Compiled with Numba when available.
+    """
+    for i in range(lats.shape[0]):
+        lat = lats[i]
+        lng = lngs[i]
+        renewable = np.float32(min(max(0.5 + (lat - 35) / 100 + noise[i, 0] * 0.1, 0.0), 1.0))
+        demand = np.float32(min(max(0.6 + (lng + 120) / 100 + noise[i, 1] * 0.1, 0.0), 1.0))
+        transport = np.float32(min(max(0.7 + noise[i, 2] * 0.15, 0.0), 1.0))
+        land = np.float32(1000000 + abs(lat) * 50000 + abs(lng) * 30000)
+        energy = np.float32(0.1 + abs(lat - 40) * 0.002 + noise[i, 3] * 0.02)
+        subsidy = np.float32(min(max(0.5 + (40 - abs(lat)) / 100 + noise[i, 4] * 0.1, 0.0), 1.0))
+        
+        out_eff[i, 0] = renewable * eff_scale[0] + eff_offset[0]
+        out_eff[i, 1] = demand * eff_scale[1] + eff_offset[1]
+        out_eff[i, 2] = transport * eff_scale[2] + eff_offset[2]
+        out_eff[i, 3] = subsidy * eff_scale[3] + eff_offset[3]
+        
+        out_cost[i, 0] = (land - cost_mean[0]) / cost_scale[0]
+        out_cost[i, 1] = (energy - cost_mean[1]) / cost_scale[1]
+        out_cost[i, 2] = demand
+        out_cost[i, 3] = subsidy
+
+if njit is not None:
+    # nogil lets score_batch's shard threads run the kernel in parallel
+    _featurize_kernel = njit(cache=True, fastmath=True, nogil=True)(_featurize_rows)
+    # Compile once at import for every output layout so the first request does not pay the JIT cost
+    for _eff_order in ('C', 'F'):
+        for _cost_order in ('C', 'F'):
+            _featurize_kernel(
+                np.zeros(2), np.zeros(2), np.zeros((2, 6), dtype=np.float32),
+                np.ones(4, dtype=np.float32), np.zeros(4, dtype=np.float32),
+                np.zeros(2, dtype=np.float32), np.ones(2, dtype=np.float32),
+                np.empty((2, 4), dtype=np.float32, order=_eff_order),
+                np.empty((2, 4), dtype=np.float32, order=_cost_order)
+            )
+else:
+    _featurize_kernel = None
+
+class CompiledModel:
+    """Adapter exposing a treelite compiled predictor through the estimator predict() API."""
+    
+    def __init__(self, libpath: str):
+        self.predictor = treelite_runtime.Predictor(libpath, nthread=1)
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # treelite squeezes single-row output to a scalar; keep the (B,) shape of predict()
+        return np.ravel(self.predictor.predict(treelite_runtime.DMatrix(X)))
+
+def load_model(name: str):
+    """Load models/<name>.so as a compiled predictor if available, else models/<name>.pkl."""
+    libpath = f'models/{name}.so'
+    if treelite_runtime is not None and os.path.exists(libpath):
+        logger.info("Using compiled predictor %s", libpath)
+        return CompiledModel(libpath)
+    # Memory-map the arrays inside the (uncompressed) pickle so worker processes share page cache
+    return joblib.load(f'models/{name}.pkl', mmap_mode='r')
+
+class ScalerParams(NamedTuple):
+    """Fitted scaler parameters as float32 arrays, loaded from models/scalers.npz."""
+    eff_scale: np.ndarray     # MinMaxScaler: X * eff_scale + eff_offset
+    eff_offset: np.ndarray
+    cost_mean: np.ndarray     # StandardScaler: (X - cost_mean) / cost_scale
+    cost_scale: np.ndarray
+
+def load_scaler_params(path: str = 'models/scalers.npz') -> ScalerParams:
+    """Load scaler parameters without importing or unpickling sklearn objects."""
+    with np.load(path) as params:
+        return ScalerParams(*(params[field].astype(np.float32) for field in ScalerParams._fields))
+
+def load_inference_layout(path: str = 'models/inference_layout.json') -> Dict[str, str]:
+    """
+    Load the per-model input memory order ('C' row-major or 'F' feature-major)
+    benchmarked at training time. Defaults to row-major when absent.
+    """
+    layout = {'efficiency': 'C', 'cost': 'C'}
+    if os.path.exists(path):
+        with open(path) as f:
+            layout.update(json.load(f))
+    return layout
+
 class ModelManager:
     """Manages ML models and predictions."""
     
@@ -43,112 +216,302 @@ class ModelManager:
         self.efficiency_model = None
         self.cost_model = None
         self.scalers = None
+        self.layout = None
+        self.gpu_booster = None
+        self.shard_booster = None
+        self._tls = threading.local()
+        # One pool per process, reused by every large batch request
+        self._n_threads = thread_budget()
+        self._n_shards = self._n_threads
+        self._executor = ThreadPoolExecutor(max_workers=self._n_shards)
         self.load_models()
+        # Per-instance LRU so cached results never outlive the models that produced them
+        self._predict_cached = functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)(self._predict_location)
     
     def load_models(self):
         """Load trained models and scalers."""
         try:
-            self.efficiency_model = joblib.load('models/eff_model.pkl')
-            self.cost_model = joblib.load('models/cost_model.pkl')
-            self.scalers = joblib.load('models/scalers.pkl')
+            self.efficiency_model = load_model('eff_model')
+            if hasattr(self.efficiency_model, 'get_booster'):
+                # Unsharded batches would otherwise use every core in every worker
+                self.efficiency_model.set_params(n_jobs=self._n_threads)
+            self.cost_model = load_model('cost_model')
+            self.scalers = load_scaler_params()
+            self.layout = load_inference_layout()
+            self.gpu_booster = self._load_gpu_booster()
+            self.shard_booster = self._load_shard_booster()
             logger.info("Models loaded successfully")
         except FileNotFoundError:
             logger.error("Model files not found. Train models first.")
             raise
     
-    def get_dummy_features(self, lat: float, lng: float) -> Dict[str, float]:
+    def _load_gpu_booster(self):
+        """
+        Return a CUDA copy of the XGBoost efficiency booster when cupy and a GPU
+        are available, else None. The booster comes from models/eff_model.pkl even
+        when a compiled predictor is served, which stays in use for small batches.
+        """
+        if cupy is None:
+            return None
+        try:
+            if not cupy.cuda.is_available():
+                return None
+        except cupy.cuda.runtime.CUDARuntimeError:
+            return None
+        
+        model = self.efficiency_model
+        if not hasattr(model, 'get_booster'):
+            model = joblib.load('models/eff_model.pkl', mmap_mode='r')
+        booster = model.get_booster().copy()
+        booster.set_param({'device': 'cuda'})
+        logger.info("GPU inference enabled for batches of %d+ rows", GPU_BATCH_THRESHOLD)
+        return booster
+    
+    def _load_shard_booster(self):
+        """
+        Return a single-threaded copy of the XGBoost efficiency booster for sharded
+        batches, else None. Shards already use the whole thread budget, so letting each one
+        start its own OpenMP team would oversubscribe the CPU. Not needed for a
+        compiled predictor, which already runs single-threaded.
+        """
+        if not hasattr(self.efficiency_model, 'get_booster'):
+            return None
+        booster = self.efficiency_model.get_booster().copy()
+        booster.set_param({'nthread': 1})
+        return booster
+    
+    def predict_efficiency(self, eff_array: np.ndarray) -> np.ndarray:
+        """Run the efficiency model, on the GPU for large batches when available."""
+        if self.gpu_booster is not None and eff_array.shape[0] >= GPU_BATCH_THRESHOLD:
+            return cupy.asnumpy(self.gpu_booster.inplace_predict(cupy.asarray(eff_array)))
+        return self.efficiency_model.predict(eff_array)
+    
+    def db_connection(self):
+        """
+        Borrow a pooled PostgreSQL connection for spatial feature queries.
+        The pool is shared process-wide and created on first use, so the API
+        still starts when no database is reachable.
         """
-        Generate dummy features for a given location.
+        return database.connection()
+    
+    def _row_buffers(self) -> tuple:
+        """
+        Thread-local (features, eff, cost) float32 buffers for single-location
+        scoring. Reused on every call from the same thread.
+        """
+        buffers = getattr(self._tls, 'buffers', None)
+        if buffers is None:
+            buffers = self._tls.buffers = (
+                np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float32),
+                np.empty((1, len(EFFICIENCY_FEATURES)), dtype=np.float32),
+                np.empty((1, len(COST_FEATURES)), dtype=np.float32)
+            )
+        return buffers
+    
+    def get_dummy_features_batch(self, lats: np.ndarray, lngs: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Generate dummy features for a batch of locations.
+        Returns a (B, 6) float32 array with columns in FEATURE_COLUMNS order,
+        written into `out` when given.
         In production, this would query a database or spatial service.
         """
-        # Simple dummy feature generation based on coordinates
-        # This is a placeholder - real implementation would use spatial queries
-        seed_value = hash(f"{lat}_{lng}") % (2**32 - 1)
-        np.random.seed(seed_value)
-        
-        features = {
-            'renewable_proximity': max(0, min(1, 0.5 + (lat - 35) / 100 + np.random.normal(0, 0.1))),
-            'demand_proximity': max(0, min(1, 0.6 + (lng + 120) / 100 + np.random.normal(0, 0.1))),
-            'transport_score': max(0, min(1, 0.7 + np.random.normal(0, 0.15))),
-            'land_cost': 1000000 + abs(lat) * 50000 + abs(lng) * 30000,
-            'energy_cost': 0.1 + abs(lat - 40) * 0.002 + np.random.normal(0, 0.02),
-            'subsidy_score': max(0, min(1, 0.5 + (40 - abs(lat)) / 100 + np.random.normal(0, 0.1)))
-        }
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        noise = _location_noise(lats, lngs)
+        
+        features = out if out is not None else np.empty((lats.shape[0], len(FEATURE_COLUMNS)), dtype=np.float32)
+        features[:, 0] = np.clip(0.5 + (lats - 35) / 100 + noise[:, 0] * 0.1, 0, 1)      # renewable_proximity
+        features[:, 1] = np.clip(0.6 + (lngs + 120) / 100 + noise[:, 1] * 0.1, 0, 1)     # demand_proximity
+        features[:, 2] = np.clip(0.7 + noise[:, 2] * 0.15, 0, 1)                         # transport_score
+        features[:, 3] = 1000000 + np.abs(lats) * 50000 + np.abs(lngs) * 30000           # land_cost
+        features[:, 4] = 0.1 + np.abs(lats - 40) * 0.002 + noise[:, 3] * 0.02            # energy_cost
+        features[:, 5] = np.clip(0.5 + (40 - np.abs(lats)) / 100 + noise[:, 4] * 0.1, 0, 1)  # subsidy_score
         
         return features
     
-    def preprocess_features(self, features: Dict[str, float]) -> tuple:
-        """Preprocess features for model input."""
-        # Features for efficiency model (all already 0-1 range)
-        eff_features = ['renewable_proximity', 'demand_proximity', 'transport_score', 'subsidy_score']
-        eff_array = np.array([[features[f] for f in eff_features]])
-        
-        # Features for cost model - only scale land_cost and energy_cost
-        cost_features = ['land_cost', 'energy_cost', 'demand_proximity', 'subsidy_score']
-        cost_array = np.array([[features[f] for f in cost_features]])
-        
-        # Apply normalization
-        if self.scalers:
-            # Efficiency features are already 0-1, just use the scaler if it exists
-            eff_array = self.scalers['efficiency'].transform(eff_array)
-            
-            # Scale only the numerical cost features
-            # Create a temporary array with just land_cost and energy_cost for scaling
-            temp_cost_features = ['land_cost', 'energy_cost']
-            temp_array = np.array([[features[f] for f in temp_cost_features]])
-            temp_scaled = self.scalers['cost'].transform(temp_array)
-            
-            # Rebuild the full cost array with scaled values + original normalized values
-            cost_array = np.array([[
-                temp_scaled[0][0],              # scaled land_cost
-                temp_scaled[0][1],              # scaled energy_cost
-                features['demand_proximity'],   # already 0-1
-                features['subsidy_score']       # already 0-1
-            ]])
+    def get_dummy_features(self, lat: float, lng: float) -> Dict[str, float]:
+        """Generate dummy features for a single location."""
+        row = self.get_dummy_features_batch(np.array([lat]), np.array([lng]))[0]
+        return dict(zip(FEATURE_COLUMNS, row.tolist()))
+    
+    def preprocess_features_batch(self, features: np.ndarray, out_eff: Optional[np.ndarray] = None,
+                                  out_cost: Optional[np.ndarray] = None) -> tuple:
+        """
+        Preprocess a (B, 6) feature matrix into (B, 4) efficiency and cost model inputs,
+        written into `out_eff`/`out_cost` when given, otherwise allocated in the
+        memory order benchmarked at training time.
+        """
+        if out_eff is None:
+            out_eff = np.empty((features.shape[0], len(EFFICIENCY_FEATURES)), dtype=np.float32, order=self.layout['efficiency'])
+        if out_cost is None:
+            out_cost = np.empty((features.shape[0], len(COST_FEATURES)), dtype=np.float32, order=self.layout['cost'])
+        eff_array = np.take(features, EFFICIENCY_COLUMN_INDEX, axis=1, out=out_eff)
+        cost_array = np.take(features, COST_COLUMN_INDEX, axis=1, out=out_cost)
+        
+        # Apply normalization in place
+        eff_array *= self.scalers.eff_scale
+        eff_array += self.scalers.eff_offset
+        
+        # Scale only land_cost and energy_cost; demand_proximity and
+        # subsidy_score are already 0-1
+        cost_array[:, :2] -= self.scalers.cost_mean
+        cost_array[:, :2] /= self.scalers.cost_scale
         
         return eff_array, cost_array
     
+    def preprocess_features(self, features: Dict[str, float]) -> tuple:
+        """Preprocess features of a single location for model input."""
+        row = np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float32)
+        row[0] = [features[f] for f in FEATURE_COLUMNS]
+        return self.preprocess_features_batch(row)
+    
     def predict_zone(self, efficiency: float, cost: float) -> str:
         """Categorize zone based on efficiency and cost."""
-        if efficiency > 0.8 and cost < 2.5:
-            return "green"
-        elif efficiency > 0.6:
-            return "yellow"
-        else:
-            return "red"
+        return str(self.predict_zones(np.array([efficiency]), np.array([cost]))[0])
     
-    def predict(self, lat: float, lng: float) -> Dict[str, Any]:
-        """Make predictions for a single location."""
-        try:
+    def predict_zones(self, efficiency: np.ndarray, cost: np.ndarray) -> np.ndarray:
+        """Categorize a batch of zones: green (eff > 0.8 and cost < 2.5), yellow (eff > 0.6), else red."""
+        idx = (efficiency > 0.6).astype(np.int8) + ((efficiency > 0.8) & (cost < 2.5)).astype(np.int8)
+        return _ZONES[idx]
+    
+    def featurize_batch(self, lats: np.ndarray, lngs: np.ndarray, out_eff: Optional[np.ndarray] = None,
+                        out_cost: Optional[np.ndarray] = None) -> tuple:
+        """
+        Compiled equivalent of get_dummy_features_batch + preprocess_features_batch.
+        Requires Numba.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if out_eff is None:
+            out_eff = np.empty((lats.shape[0], len(EFFICIENCY_FEATURES)), dtype=np.float32, order=self.layout['efficiency'])
+        if out_cost is None:
+            out_cost = np.empty((lats.shape[0], len(COST_FEATURES)), dtype=np.float32, order=self.layout['cost'])
+        
+        _featurize_kernel(
+            lats, lngs, _location_noise(lats, lngs),
+            self.scalers.eff_scale, self.scalers.eff_offset, self.scalers.cost_mean, self.scalers.cost_scale,
+            out_eff, out_cost
+        )
+        return out_eff, out_cost
+    
+    def _featurize(self, lats: np.ndarray, lngs: np.ndarray, buffers: Optional[tuple] = None) -> tuple:
+        """
+        Build scaled (eff, cost) model inputs for a batch of locations.
+        `buffers` optionally supplies preallocated (features, eff, cost) input arrays.
+        """
+        features_buf, eff_buf, cost_buf = buffers if buffers is not None else (None, None, None)
+        
+        if _featurize_kernel is not None:
+            eff_array, cost_array = self.featurize_batch(lats, lngs, eff_buf, cost_buf)
+        else:
             # Get features (in production, this would query a database)
-            features = self.get_dummy_features(lat, lng)
+            features = self.get_dummy_features_batch(lats, lngs, out=features_buf)
             
             # Preprocess features
-            eff_array, cost_array = self.preprocess_features(features)
-            
-            # Make predictions
-            efficiency = float(self.efficiency_model.predict(eff_array)[0])
-            cost = float(self.cost_model.predict(cost_array)[0])
-            
-            # Ensure predictions are within reasonable bounds
-            efficiency = max(0, min(1, efficiency))
-            cost = max(0.5, min(10, cost))
-            
-            # Determine zone category
-            zone = self.predict_zone(efficiency, cost)
+            eff_array, cost_array = self.preprocess_features_batch(features, eff_buf, cost_buf)
+        
+        return eff_array, cost_array
+    
+    def _score_batch(self, lats: np.ndarray, lngs: np.ndarray, buffers: Optional[tuple] = None) -> tuple:
+        """Run both models over a batch of locations, returning clipped (efficiency, cost) arrays."""
+        eff_array, cost_array = self._featurize(lats, lngs, buffers)
+        
+        # Make predictions
+        efficiency = self.predict_efficiency(eff_array)
+        cost = self.cost_model.predict(cost_array)
+        
+        # Ensure predictions are within reasonable bounds
+        return np.clip(efficiency, 0, 1), np.clip(cost, 0.5, 10)
+    
+    def _score_shard(self, lats: np.ndarray, lngs: np.ndarray) -> tuple:
+        """Score one shard of a large batch with single-threaded models."""
+        eff_array, cost_array = self._featurize(lats, lngs)
+        
+        if self.shard_booster is not None:
+            efficiency = self.shard_booster.inplace_predict(eff_array)
+        else:
+            efficiency = self.efficiency_model.predict(eff_array)
+        cost = self.cost_model.predict(cost_array)
+        
+        return np.clip(efficiency, 0, 1), np.clip(cost, 0.5, 10)
+    
+    def score_batch(self, lats: np.ndarray, lngs: np.ndarray) -> tuple:
+        """Score a batch of locations, sharding large batches across CPU cores."""
+        if lats.shape[0] <= PARALLEL_BATCH_THRESHOLD or self._n_shards == 1:
+            return self._score_batch(lats, lngs)
+        
+        if self.gpu_booster is not None:
+            # Score efficiency on the GPU in one call over the whole batch, since
+            # shards could fall under GPU_BATCH_THRESHOLD; only the CPU cost model is sharded
+            eff_array, cost_array = self._featurize(lats, lngs)
+            efficiency = self.predict_efficiency(eff_array)
+            cost = np.concatenate(list(self._executor.map(
+                self.cost_model.predict, np.array_split(cost_array, self._n_shards)
+            )))
+            return np.clip(efficiency, 0, 1), np.clip(cost, 0.5, 10)
+        
+        # Threads rather than processes: tree predict releases the GIL and the
+        # models do not have to be pickled to every worker on each request
+        shards = list(self._executor.map(
+            self._score_shard, np.array_split(lats, self._n_shards), np.array_split(lngs, self._n_shards)
+        ))
+        efficiency = np.concatenate([shard[0] for shard in shards])
+        cost = np.concatenate([shard[1] for shard in shards])
+        return efficiency, cost
+    
+    def predict_batch(self, lats: np.ndarray, lngs: np.ndarray) -> List[Dict[str, Any]]:
+        """Make predictions for a batch of locations with one model call per model."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if lats.size == 0:
+            return []
+        
+        try:
+            efficiency, cost = self.score_batch(quantize_coords(lats), quantize_coords(lngs))
+            zones = self.predict_zones(efficiency, cost)
             
-            return {
-                'lat': lat,
-                'lng': lng,
-                'efficiency': round(efficiency, 3),
-                'cost': round(cost, 2),
-                'zone': zone,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            timestamp = datetime.utcnow().isoformat()
+            return [
+                {
+                    'lat': lat,
+                    'lng': lng,
+                    'efficiency': round(eff, 3),
+                    'cost': round(c, 2),
+                    'zone': zone,
+                    'timestamp': timestamp
+                }
+                for lat, lng, eff, c, zone in zip(
+                    lats.tolist(), lngs.tolist(), efficiency.tolist(), cost.tolist(), zones.tolist()
+                )
+            ]
             
         except Exception as e:
-            logger.error(f"Prediction error: {str(e)}")
+            logger.error("Prediction error: %s", e)
             raise
+    
+    def _predict_location(self, lat_q: float, lng_q: float) -> tuple:
+        """Predict (efficiency, cost, zone) for a quantized location. Memoized per instance."""
+        efficiency, cost = self._score_batch(np.array([lat_q]), np.array([lng_q]), self._row_buffers())
+        efficiency, cost = float(efficiency[0]), float(cost[0])
+        return round(efficiency, 3), round(cost, 2), self.predict_zone(efficiency, cost)
+    
+    def predict(self, lat: float, lng: float) -> Dict[str, Any]:
+        """Make predictions for a single location."""
+        try:
+            lat_q, lng_q = quantize_coords(np.array([lat, lng], dtype=np.float64)).tolist()
+            efficiency, cost, zone = self._predict_cached(lat_q, lng_q)
+        except Exception as e:
+            logger.error("Prediction error: %s", e)
+            raise
+        
+        return {
+            'lat': lat,
+            'lng': lng,
+            'efficiency': efficiency,
+            'cost': cost,
+            'zone': zone,
+            'timestamp': datetime.utcnow().isoformat()
+        }
 
 # Initialize model manager
 model_manager = ModelManager()
@@ -180,9 +543,11 @@ async def predict_zones(
     """
     try:
         prediction = model_manager.predict(lat, lng)
-        return PredictionResponse(**prediction)
+        # Returning the response directly skips re-validating internally built
+        # fields; response_model still documents the schema
+        return ORJSONResponse(prediction)
     except Exception as e:
-        logger.error(f"API error: {str(e)}")
+        logger.error("API error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/predict-zones/batch")
@@ -194,14 +559,14 @@ async def predict_zones_batch(request: PredictionRequest):
     Output: List of predictions with efficiency, cost, and zone
     """
     try:
-        results = []
-        for location in request.locations:
-            prediction = model_manager.predict(location['lat'], location['lng'])
-            results.append(prediction)
+        count = len(request.locations)
+        lats = np.fromiter((location['lat'] for location in request.locations), dtype=np.float64, count=count)
+        lngs = np.fromiter((location['lng'] for location in request.locations), dtype=np.float64, count=count)
+        results = model_manager.predict_batch(lats, lngs)
         
-        return {"predictions": results}
+        return ORJSONResponse({"predictions": results})
     except Exception as e:
-        logger.error(f"Batch prediction error: {str(e)}")
+        logger.error("Batch prediction error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
@@ -223,4 +588,5 @@ async def http_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
+    logging.basicConfig(level=logging.INFO)
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
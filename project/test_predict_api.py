@@ -0,0 +1,27 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from predict_api import app
+
+client = TestClient(app)
+
+def test_single_and_batch_predictions_agree():
+    # Half-way coordinates at the quantization boundary, where Python's round()
+    # and np.round() disagree, plus random points on the same 5-decimal grid
+    rng = np.random.default_rng(0)
+    lats = np.concatenate(([2.89235], np.round(rng.uniform(-60, 60, 200), 4) + 0.00005))
+    lngs = np.concatenate(([-50.68935], np.round(rng.uniform(-180, 180, 200), 4) + 0.00005))
+    locations = [{'lat': lat, 'lng': lng} for lat, lng in zip(lats.tolist(), lngs.tolist())]
+    
+    batch = client.post("/predict-zones/batch", json={'locations': locations}).json()['predictions']
+    mismatches = 0
+    for location, batch_prediction in zip(locations, batch):
+        single = client.get("/predict-zones", params=location).json()
+        if any(single[k] != batch_prediction[k] for k in ('efficiency', 'cost', 'zone')):
+            mismatches += 1
+            print(f"✗ {location}: single {single} vs batch {batch_prediction}")
+    
+    assert mismatches == 0, f"{mismatches} of {len(locations)} locations differ between endpoints"
+
+if __name__ == "__main__":
+    test_single_and_batch_predictions_agree()
+    print("✓ Single and batch predictions agree")